@@ -3,6 +3,7 @@ from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.requests import Request
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 import asyncio
 import csv
 import io
@@ -218,7 +219,8 @@ async def ingest_raw_data(request: Request):
         inserted = 0
         for point in data_points:
             doc = {
-                "deviceId": device_id,
+                # Пакет может содержать точки разных устройств (batch-загрузка)
+                "deviceId": point.get("deviceId") or device_id,
                 "kind": point.get("kind", "legacy"),
                 "timestamp": point.get("timestamp", int(datetime.utcnow().timestamp() * 1000)),
                 "gps": point.get("gps"),
@@ -416,19 +418,27 @@ async def get_raw_data(
 async def get_processed_events(
     limit: int = Query(100, ge=1, le=50000, description="Максимальное количество событий (1-50000)"),
     skip: int = Query(0, ge=0, description="Количество событий для пропуска"),
-    event_type: str = None
+    event_type: str = None,
+    device_id: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Вернуть только эти поля (через запятую), например deviceId,eventType")
 ):
     """Получить обработанные события из коллекции processed_events"""
     try:
         query = {}
         if event_type:
             query["eventType"] = event_type
+        if device_id:
+            query["deviceId"] = device_id
+        
+        projection = {"_id": 0}
+        if fields:
+            projection.update({field.strip(): 1 for field in fields.split(",") if field.strip()})
         
         total = await _config.db.processed_events.count_documents(query)
         
         events = await _config.db.processed_events.find(
             query,
-            {"_id": 0}
+            projection
         ).sort("timestamp", -1).skip(skip).limit(limit).to_list(limit)
         
         return {
@@ -1203,7 +1213,7 @@ async def get_region_warnings(region_code: str, since: str = None):
     query = {"status": "active", "expiresAt": {"$gt": datetime.utcnow()}}
     if since:
         try:
-            since_dt = datetime.fromisoformat(since.replace("Z", "+00:00")).replace(tzinfo=None)
+            since_dt = datetime.fromisoformat(since).replace(tzinfo=None)
             query["updated_at"] = {"$gt": since_dt}
         except Exception:
             pass
@@ -3623,4 +3633,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие JSON-ответов (списки препятствий, кластеры, аналитика) для клиентов с Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Old shutdown handler removed - using new startup/shutdown events above
\ No newline at end of file
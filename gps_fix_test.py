@@ -41,6 +41,9 @@ def test_admin_sensor_data_gps_fix():
             
         print(f"✅ Retrieved {len(sensor_data)} sensor data records")
         print(f"📊 Total records in DB: {data.get('total', 0)}")
+        # requests sends Accept-Encoding: gzip by default; the backend compresses bodies over 1 KB
+        print(f"🗜️  Content-Encoding: {response.headers.get('Content-Encoding', 'identity')} "
+              f"({len(response.content)} bytes decoded)")
         
         # Analyze each record according to requirements
         print("\n🗺️  DETAILED GPS COORDINATE ANALYSIS:")
@@ -12,13 +12,16 @@ import os
 # Backend URL
 BACKEND_URL = "https://soundzummer.preview.emergentagent.com/api"
 
+# Shared session: keeps the TLS connection to each host alive between requests
+session = requests.Session()
+
 def test_latest_5_records():
     """GET /api/admin/sensor-data?limit=5 - получить последние 5 записей"""
     print("🔍 TEST 1: GET /api/admin/sensor-data?limit=5")
     print("=" * 60)
     
     try:
-        response = requests.get(f"{BACKEND_URL}/admin/sensor-data?limit=5", timeout=10)
+        response = session.get(f"{BACKEND_URL}/admin/sensor-data?limit=5", timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -76,7 +79,7 @@ def test_analytics_total_points():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{BACKEND_URL}/admin/analytics", timeout=10)
+        response = session.get(f"{BACKEND_URL}/admin/analytics", timeout=10)
         
         if response.status_code == 200:
             data = response.json()
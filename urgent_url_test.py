@@ -16,6 +16,9 @@ import sys
 URL_PREVIEW = "https://soundzummer.preview.emergentagent.com"
 URL_EMERGENT = "https://smoothroad.emergent.host"
 
+# Shared session: keeps the TLS connection to each host alive between requests
+session = requests.Session()
+
 def test_url_connectivity(base_url, url_name):
     """Test basic connectivity and API endpoints for a given URL"""
     print(f"\n{'='*60}")
@@ -38,9 +41,9 @@ def test_url_connectivity(base_url, url_name):
     # Test 1: Basic connectivity
     try:
         print(f"1. Testing basic connectivity...")
-        start_time = time.time()
-        response = requests.get(f"{base_url}/api/", timeout=10)
-        response_time = time.time() - start_time
+        start_time = time.perf_counter()
+        response = session.get(f"{base_url}/api/", timeout=10)
+        response_time = time.perf_counter() - start_time
         
         if response.status_code == 200:
             print(f"   ✅ CONNECTED (Status: {response.status_code}, Time: {response_time:.2f}s)")
@@ -60,12 +63,13 @@ def test_url_connectivity(base_url, url_name):
     try:
         print(f"2. Testing POST /api/sensor-data...")
         
+        timestamp = int(time.time() * 1000)
         test_data = {
             "deviceId": "urgent-connectivity-test-device",
             "sensorData": [
                 {
                     "type": "location",
-                    "timestamp": int(time.time() * 1000),
+                    "timestamp": timestamp,
                     "data": {
                         "latitude": 55.7558,
                         "longitude": 37.6176,
@@ -75,7 +79,7 @@ def test_url_connectivity(base_url, url_name):
                 },
                 {
                     "type": "accelerometer", 
-                    "timestamp": int(time.time() * 1000),
+                    "timestamp": timestamp,
                     "data": {
                         "x": 0.2,
                         "y": 0.4,
@@ -85,14 +89,14 @@ def test_url_connectivity(base_url, url_name):
             ]
         }
         
-        start_time = time.time()
-        response = requests.post(
+        start_time = time.perf_counter()
+        response = session.post(
             f"{base_url}/api/sensor-data",
             json=test_data,
             headers={"Content-Type": "application/json"},
             timeout=15
         )
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         
         if response.status_code == 200:
             print(f"   ✅ POST SUCCESS (Status: {response.status_code}, Time: {response_time:.2f}s)")
@@ -113,12 +117,12 @@ def test_url_connectivity(base_url, url_name):
     try:
         print(f"3. Testing GET /api/admin/sensor-data...")
         
-        start_time = time.time()
-        response = requests.get(
+        start_time = time.perf_counter()
+        response = session.get(
             f"{base_url}/api/admin/sensor-data?limit=5",
             timeout=10
         )
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         
         if response.status_code == 200:
             print(f"   ✅ GET SUCCESS (Status: {response.status_code}, Time: {response_time:.2f}s)")
@@ -162,7 +166,7 @@ def test_url_connectivity(base_url, url_name):
     try:
         print(f"4. Testing GET /api/admin/analytics for activity...")
         
-        response = requests.get(f"{base_url}/api/admin/analytics", timeout=10)
+        response = session.get(f"{base_url}/api/admin/analytics", timeout=10)
         
         if response.status_code == 200:
             analytics = response.json()